@@ -0,0 +1,173 @@
+﻿"""
+Whisper model artifact cache.
+
+Roots are searched in order: the image-baked WHISPER_CACHE, then an optional host-mounted
+WHISPER_SHARED_CACHE shared by every container on the instance. Each prefetched model gets a
+content-hash manifest (<root>/manifests/<model>.json) that is checked before the weights are used.
+With WHISPER_OFFLINE=1 a cache miss fails fast instead of reaching the network.
+"""
+import argparse
+import fcntl
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+MANIFEST_DIR = "manifests"
+VERIFY_MODES = {"full", "size", "off"}
+
+class ModelCacheError(RuntimeError):
+    pass
+
+def offline() -> bool:
+    return os.getenv("WHISPER_OFFLINE", "") == "1"
+
+def cache_roots():
+    roots = [os.getenv("WHISPER_CACHE", "/root/.cache/whisper"), os.getenv("WHISPER_SHARED_CACHE")]
+    return [r for r in roots if r]
+
+def _manifest_path(root: str, model: str) -> str:
+    safe = model.replace("/", "--")
+    return os.path.join(root, MANIFEST_DIR, f"{safe}.json")
+
+def _sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _snapshot_files(model_dir: str):
+    for dirpath, _, names in os.walk(model_dir):
+        for name in sorted(names):
+            full = os.path.join(dirpath, name)
+            yield os.path.relpath(full, model_dir), full
+
+def write_manifest(root: str, model: str, model_dir: str) -> dict:
+    files = {}
+    for rel, full in _snapshot_files(model_dir):
+        files[rel] = {"size": os.path.getsize(full), "sha256": _sha256(full)}
+    manifest = {
+        "model": model,
+        # relative so a shared cache verifies regardless of where it is mounted
+        "path": os.path.relpath(model_dir, root),
+        "created_utc": datetime.now(timezone.utc).isoformat(),
+        "files": files,
+    }
+    path = _manifest_path(root, model)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, path)
+    return manifest
+
+def verify(root: str, manifest: dict, mode: str = "full") -> str:
+    """Returns the model directory, or raises ModelCacheError if it does not match the manifest."""
+    model_dir = os.path.join(root, manifest["path"])
+    if mode == "off":
+        return model_dir
+    for rel, expect in manifest["files"].items():
+        full = os.path.join(model_dir, rel)
+        if not os.path.isfile(full):
+            raise ModelCacheError(f"missing {full}")
+        if os.path.getsize(full) != expect["size"]:
+            raise ModelCacheError(f"size mismatch for {full}")
+        if mode == "full" and _sha256(full) != expect["sha256"]:
+            raise ModelCacheError(f"sha256 mismatch for {full}")
+    return model_dir
+
+def _lookup(root: str, model: str, mode: str):
+    path = _manifest_path(root, model)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+        return verify(root, manifest, mode)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        # truncated or hand-edited manifest on a shared mount; treat like a failed verify
+        raise ModelCacheError(f"unreadable manifest {path}: {e!r}") from e
+
+def prefetch(model: str, root: str) -> str:
+    """Download `model` into `root` (once per root, even with concurrent containers) and record its manifest."""
+    if offline():
+        raise ModelCacheError(f"refusing to download {model}: WHISPER_OFFLINE=1")
+    from faster_whisper.utils import download_model
+
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, ".prefetch.lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # another container may have finished the download while we waited
+        try:
+            found = _lookup(root, model, "size")
+        except ModelCacheError as e:
+            print(f"[model_cache] {root}: {e}; re-fetching", file=sys.stderr, flush=True)
+            found = None
+        if found:
+            return found
+        model_dir = download_model(model, cache_dir=root)
+        write_manifest(root, model, model_dir)
+        return model_dir
+
+def resolve_model(model: str, mode: str = None) -> str:
+    """
+    Return a verified local directory for `model`, fetching only when allowed.
+    Local model paths are passed through untouched.
+    """
+    if os.path.isdir(model):
+        return model
+    mode = mode or os.getenv("MODEL_VERIFY", "size")
+    if mode not in VERIFY_MODES:
+        raise ModelCacheError(f"MODEL_VERIFY must be one of {sorted(VERIFY_MODES)}, got {mode!r}")
+
+    roots = cache_roots()
+    for root in roots:
+        try:
+            found = _lookup(root, model, mode)
+        except ModelCacheError as e:
+            print(f"[model_cache] {root}: {e}", file=sys.stderr, flush=True)
+            continue
+        if found:
+            return found
+
+    if offline():
+        raise ModelCacheError(f"model {model} not found in {roots} and WHISPER_OFFLINE=1; bake it into the image or the shared cache")
+    # fill the shared cache when mounted so the next container on this host is warm
+    target = os.getenv("WHISPER_SHARED_CACHE") or roots[0]
+    print(f"[model_cache] cache miss for {model}; fetching into {target}", flush=True)
+    return prefetch(model, target)
+
+def main():
+    parser = argparse.ArgumentParser(description="Prefetch and verify Whisper model artifacts.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("prefetch", help="Download a model and write its content-hash manifest.")
+    p.add_argument("--model", default="large-v3")
+    p.add_argument("--root", default=None, help="Cache root (default: WHISPER_SHARED_CACHE or WHISPER_CACHE).")
+    v = sub.add_parser("verify", help="Check cached weights against their manifest.")
+    v.add_argument("--model", default="large-v3")
+    v.add_argument("--mode", default="full", choices=sorted(VERIFY_MODES))
+    args = parser.parse_args()
+
+    t0 = time.time()
+    try:
+        if args.cmd == "prefetch":
+            root = args.root or os.getenv("WHISPER_SHARED_CACHE") or cache_roots()[0]
+            path = prefetch(args.model, root)
+        else:
+            path = None
+            for root in cache_roots():
+                path = _lookup(root, args.model, args.mode)
+                if path:
+                    break
+            if not path:
+                raise ModelCacheError(f"model {args.model} not found in {cache_roots()}")
+    except ModelCacheError as e:
+        print(f"[model_cache] error: {e}", file=sys.stderr)
+        sys.exit(3)
+    print(f"[model_cache] {args.cmd} {args.model} -> {path} ({time.time() - t0:.2f}s)")
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,11 @@ COMPUTE_TYPE="${COMPUTE_TYPE:-int8_float16}"
 VAD="${VAD:-}"
 INITIAL_PROMPT="${INITIAL_PROMPT:-}"
 MAX_NEW_TOKENS="${MAX_NEW_TOKENS:-}"
+PROGRESS_URI="${PROGRESS_URI:-}"
+PROGRESS_EVERY="${PROGRESS_EVERY:-30}"
+# Sub-chunk re-splits run on a window of the parent chunk's audio (seconds, chunk-relative)
+CLIP_START="${CLIP_START:-}"
+CLIP_END="${CLIP_END:-}"
 
 mkdir -p /work
 IN_LOCAL="/work/in.audio"
@@ -26,11 +31,21 @@ else
   cp "$IN_URI" "$IN_LOCAL"
 fi
 
+if [[ -n "$CLIP_START" || -n "$CLIP_END" ]]; then
+  echo "[run] clipping input to [${CLIP_START:-0}, ${CLIP_END:-end}]"
+  CLIP_ARGS=(-ss "${CLIP_START:-0}")
+  [[ -n "$CLIP_END" ]] && CLIP_ARGS+=(-to "$CLIP_END")
+  ffmpeg -hide_banner -nostdin -loglevel error -i "$IN_LOCAL" "${CLIP_ARGS[@]}" \
+    -acodec pcm_s16le -ar 16000 -ac 1 -y /work/clip.wav
+  IN_LOCAL="/work/clip.wav"
+fi
+
 ARGS=(--audio "$IN_LOCAL" --out "$OUT_LOCAL" --model "$MODEL" --beam_size "$BEAM_SIZE" --compute_type "$COMPUTE_TYPE")
 [[ -n "$LANGUAGE" ]] && ARGS+=(--language "$LANGUAGE")
 [[ -n "$INITIAL_PROMPT" ]] && ARGS+=(--initial_prompt "$INITIAL_PROMPT")
 [[ -n "$MAX_NEW_TOKENS" ]] && ARGS+=(--max_new_tokens "$MAX_NEW_TOKENS")
 [[ "$VAD" == "1" ]] && ARGS+=(--vad_filter)
+[[ -n "$PROGRESS_URI" ]] && ARGS+=(--progress_uri "$PROGRESS_URI" --progress_every "$PROGRESS_EVERY")
 
 echo "[run] transcribing... (${ARGS[*]})"
 python3 /app/transcribe.py "${ARGS[@]}"
@@ -8,12 +8,30 @@ from datetime import datetime, timezone
 from faster_whisper import WhisperModel
 import ctranslate2
 
+from model_cache import ModelCacheError, resolve_model
+
 def pick_device():
     env = os.getenv("WHISPER_DEVICE")
     if env in {"cuda", "cpu", "auto"}:
         return env
     return "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
 
+def write_progress(uri, payload):
+    """
+    Persist a progress snapshot to a local path or s3://bucket/key.
+    The straggler controller polls these to project each chunk's finish time.
+    """
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    if uri.startswith("s3://"):
+        import boto3
+        from s3io import parse_s3
+        b, k = parse_s3(uri)
+        boto3.client("s3").put_object(Bucket=b, Key=k, Body=data, ContentType="application/json")
+    else:
+        os.makedirs(os.path.dirname(uri) or ".", exist_ok=True)
+        with open(uri, "wb") as f:
+            f.write(data)
+
 def main():
     parser = argparse.ArgumentParser(description="Transcribe one audio file with faster-whisper.")
     parser.add_argument("--audio", required=True, help="Path to local audio file (wav/mp3/m4a/ogg/flac).")
@@ -26,6 +44,8 @@ def main():
     parser.add_argument("--compute_type", default="int8_float16", help="CTranslate2 compute type.")
     parser.add_argument("--max_new_tokens", type=int, default=None)
     parser.add_argument("--initial_prompt", default=None, help="Optional prepend prompt for chunk continuity.")
+    parser.add_argument("--progress_uri", default=None, help="Optional local path or s3:// URI for periodic progress snapshots.")
+    parser.add_argument("--progress_every", type=float, default=30.0, help="Seconds between progress snapshots (default: 30).")
     args = parser.parse_args()
 
     audio_path = args.audio
@@ -39,12 +59,23 @@ def main():
     print(f"[info] device={device} model={args.model} compute_type={args.compute_type}", flush=True)
 
     t0 = time.time()
+    started_utc = datetime.now(timezone.utc).isoformat()
+    try:
+        model_path = resolve_model(args.model)
+    except ModelCacheError as e:
+        print(f"[error] model resolve failed: {e}", file=sys.stderr)
+        sys.exit(3)
+    resolve_s = time.time() - t0
+    print(f"[info] model resolved in {resolve_s:.2f}s -> {model_path}", flush=True)
+
+    t_load = time.time()
     model = WhisperModel(
-        args.model,
+        model_path,
         device=device,
         compute_type=args.compute_type,
-        download_root=os.getenv("WHISPER_CACHE", "/root/.cache/whisper")
     )
+    load_s = time.time() - t_load
+    print(f"[info] model loaded in {load_s:.2f}s", flush=True)
 
     segments, info = model.transcribe(
         audio_path,
@@ -57,7 +88,28 @@ def main():
     )
     load_and_cfg_s = time.time() - t0
 
+    def progress(done):
+        if not args.progress_uri:
+            return
+        payload = {
+            "started_utc": started_utc,
+            "updated_utc": datetime.now(timezone.utc).isoformat(),
+            "elapsed_s": time.time() - t0,
+            "audio_done_sec": seg_list[-1]["end"] if seg_list else 0.0,
+            "duration": getattr(info, "duration", None),
+            "done": done,
+            "batch_job_id": os.getenv("AWS_BATCH_JOB_ID"),
+            "segments": seg_list,
+        }
+        try:
+            write_progress(args.progress_uri, payload)
+        except Exception as e:
+            # progress is advisory; never fail the transcription over it
+            print(f"[warn] progress write failed: {e}", file=sys.stderr, flush=True)
+
     seg_list = []
+    progress(False)
+    last_progress = time.time()
     for i, seg in enumerate(segments):
         seg_list.append({
             "id": i,
@@ -68,6 +120,9 @@ def main():
             "no_speech_prob": getattr(seg, "no_speech_prob", None),
             "temperature": args.temperature,
         })
+        if time.time() - last_progress >= args.progress_every:
+            progress(False)
+            last_progress = time.time()
 
     out = {
         "version": "1.0",
@@ -86,13 +141,19 @@ def main():
             "language_probability": getattr(info, "language_probability", None),
             "duration": getattr(info, "duration", None),
         },
-        "timing": {"total_s": time.time() - t0, "init_and_config_s": load_and_cfg_s},
+        "timing": {
+            "total_s": time.time() - t0,
+            "init_and_config_s": load_and_cfg_s,
+            "model_resolve_s": resolve_s,
+            "model_load_s": load_s,
+        },
         "segments": seg_list,
     }
 
     os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
     with open(out_path, "w", encoding="utf-8") as f:
         json.dump(out, f, ensure_ascii=False, indent=2)
+    progress(True)
 
     rt_factor = (out["detected"]["duration"] or 0) / max(out["timing"]["total_s"], 1e-6)
     print(f"[done] wrote {out_path} | duration={out['detected']['duration']}s | wall={out['timing']['total_s']:.2f}s | x{rt_factor:.2f} realtime")
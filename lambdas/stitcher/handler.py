@@ -59,6 +59,9 @@ def _derive_job_id_from_manifest_key(manifest_key: str) -> str:
 def _parse_manifest_jsonl(text: str) -> List[Dict[str, Any]]:
     """
     Each line must contain at least: {"index": int, "start_sec": float, "end_sec": float}
+    Chunks re-split by the straggler controller additionally carry:
+      "split_at_sec": float, "winner": "parent"|"subchunks"|None,
+      "subchunks": [{"sub_index": int, "start_sec": float, "end_sec": float}, ...]
     """
     entries: List[Dict[str, Any]] = []
     for line in text.splitlines():
@@ -72,6 +75,20 @@ def _parse_manifest_jsonl(text: str) -> List[Dict[str, Any]]:
             "start_sec": float(obj["start_sec"]),
             "end_sec": float(obj["end_sec"]),
         }
+        if obj.get("subchunks"):
+            entry["split_at_sec"] = float(obj["split_at_sec"])
+            entry["winner"] = obj.get("winner")
+            entry["subchunks"] = sorted(
+                (
+                    {
+                        "sub_index": int(sc["sub_index"]),
+                        "start_sec": float(sc["start_sec"]),
+                        "end_sec": float(sc["end_sec"]),
+                    }
+                    for sc in obj["subchunks"]
+                ),
+                key=lambda x: x["sub_index"],
+            )
         entries.append(entry)
     entries.sort(key=lambda x: x["index"])
     return entries
@@ -104,19 +121,21 @@ def _guess_chunk_key(results_bucket: str, job_id: str, index: int) -> Optional[s
     contents = resp.get("Contents", [])
     for c in contents:
         key = c["Key"]
-        if key.endswith("/out.json"):
+        if key.endswith("/out.json") and "/sub-" not in key:
             # weak match: index appears in the parent path
             if f"/{index:05d}/" in key or f"/{index}/" in key or f"chunk-{index}/" in key:
                 return key
     # final fallback: if only one out.json per job, return it (single chunk case)
-    out_keys = [c["Key"] for c in contents if c["Key"].endswith("/out.json")]
+    out_keys = [c["Key"] for c in contents if c["Key"].endswith("/out.json") and "/sub-" not in c["Key"]]
     if len(out_keys) == 1:
         return out_keys[0]
     return None
 
 def _load_chunk_segments(results_bucket: str, chunk_key: str) -> List[Dict[str, Any]]:
     data = _read_s3_json(results_bucket, chunk_key)
-    segs = data.get("segments", [])
+    return _normalize_segments(data.get("segments", []))
+
+def _normalize_segments(segs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     # normalize
     norm: List[Dict[str, Any]] = []
     for s in segs:
@@ -130,6 +149,53 @@ def _load_chunk_segments(results_bucket: str, chunk_key: str) -> List[Dict[str,
         norm.append({"start": start, "end": end, "text": text})
     return norm
 
+def _resolve_pieces(entry: Dict[str, Any], results_bucket: str, job_id: str, meta: Dict[str, Any]) -> List[Tuple[List[Dict[str, Any]], float, float, float]]:
+    """
+    Returns [(relative segments, offset_sec, window start_sec, window end_sec)] for one manifest entry.
+    A re-split chunk resolves to whichever side finished first: the parent's own out.json,
+    or the parent's partial progress up to split_at_sec followed by each sub-chunk.
+    If a sub-chunk output is missing, the parent's out.json is used when present; otherwise
+    the gap is counted in meta["missing_subchunks"].
+    """
+    idx = entry["index"]
+    c_start = entry["start_sec"]
+    c_end = entry["end_sec"]
+    subchunks = entry.get("subchunks") or []
+
+    if subchunks:
+        # exact key only: _guess_chunk_key's fallbacks could pick up another chunk's output
+        parent_key = f"chunks/{job_id}/{idx}/out.json"
+        if not _s3_key_exists(results_bucket, parent_key):
+            parent_key = None
+    else:
+        parent_key = _guess_chunk_key(results_bucket, job_id, idx)
+    use_subs = bool(subchunks) and (entry.get("winner") == "subchunks" or (entry.get("winner") is None and not parent_key))
+    if not use_subs:
+        if not parent_key:
+            return []
+        return [(_load_chunk_segments(results_bucket, parent_key), c_start, c_start, c_end)]
+
+    sub_keys = [(sc, f"chunks/{job_id}/{idx}/sub-{sc['sub_index']}/out.json") for sc in subchunks]
+    missing = [sc["sub_index"] for sc, key in sub_keys if not _s3_key_exists(results_bucket, key)]
+    if missing and parent_key:
+        return [(_load_chunk_segments(results_bucket, parent_key), c_start, c_start, c_end)]
+    if missing:
+        meta["missing_subchunks"] += len(missing)
+        print(f"[stitcher] chunk {idx}: sub-chunks {missing} missing and no parent output; transcript has a gap")
+
+    split_at = entry["split_at_sec"]
+    pieces: List[Tuple[List[Dict[str, Any]], float, float, float]] = []
+    progress_key = f"chunks/{job_id}/{idx}/progress.json"
+    if _s3_key_exists(results_bucket, progress_key):
+        progress = _read_s3_json(results_bucket, progress_key)
+        pieces.append((_normalize_segments(progress.get("segments", [])), c_start, c_start, split_at))
+    for sc, sub_key in sub_keys:
+        if sc["sub_index"] in missing:
+            continue
+        # sub-chunk timestamps are relative to the sub-chunk's own window
+        pieces.append((_load_chunk_segments(results_bucket, sub_key), sc["start_sec"], sc["start_sec"], sc["end_sec"]))
+    return pieces
+
 def _merge_segments(manifest: List[Dict[str, Any]], results_bucket: str, job_id: str) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
     """
     Returns (segments, meta)
@@ -138,45 +204,43 @@ def _merge_segments(manifest: List[Dict[str, Any]], results_bucket: str, job_id:
     merged: List[Dict[str, Any]] = []
     seg_id = 0
     last_end = 0.0
-    meta = {"chunks": 0, "dropped_short": 0, "dropped_overlap": 0}
+    meta = {"chunks": 0, "dropped_short": 0, "dropped_overlap": 0, "resplit_chunks": 0, "missing_subchunks": 0}
 
     for entry in manifest:
-        idx = entry["index"]
         c_start = entry["start_sec"]
-        c_end = entry["end_sec"]
-
-        chunk_key = _guess_chunk_key(results_bucket, job_id, idx)
-        if not chunk_key:
+        pieces = _resolve_pieces(entry, results_bucket, job_id, meta)
+        if not pieces:
             # No chunk present — skip but continue
             continue
-
-        segs = _load_chunk_segments(results_bucket, chunk_key)
-
-        for s in segs:
-            gs = s["start"] + c_start
-            ge = s["end"] + c_start
-
-            # clamp to chunk window (defensive)
-            if ge < c_start + EPS or gs > c_end - EPS:
-                continue
-            gs = max(gs, c_start)
-            ge = min(ge, c_end)
-
-            # de-dupe overlap against previous global end
-            if ge <= last_end + EPS:
-                meta["dropped_overlap"] += 1
-                continue
-            if gs < last_end:
-                gs = last_end  # trim left edge into the non-overlap
-
-            # enforce min duration
-            if ge - gs < MIN_SEGMENT_SEC:
-                meta["dropped_short"] += 1
-                continue
-
-            merged.append({"id": seg_id, "start": round(gs, 3), "end": round(ge, 3), "text": s["text"]})
-            seg_id += 1
-            last_end = ge
+        if any(offset != c_start for _, offset, _, _ in pieces):
+            meta["resplit_chunks"] += 1
+
+        for segs, offset, w_start, w_end in pieces:
+            for s in segs:
+                gs = s["start"] + offset
+                ge = s["end"] + offset
+
+                # clamp to window (defensive)
+                if ge < w_start + EPS or gs > w_end - EPS:
+                    continue
+                gs = max(gs, w_start)
+                ge = min(ge, w_end)
+
+                # de-dupe overlap against previous global end
+                if ge <= last_end + EPS:
+                    meta["dropped_overlap"] += 1
+                    continue
+                if gs < last_end:
+                    gs = last_end  # trim left edge into the non-overlap
+
+                # enforce min duration
+                if ge - gs < MIN_SEGMENT_SEC:
+                    meta["dropped_short"] += 1
+                    continue
+
+                merged.append({"id": seg_id, "start": round(gs, 3), "end": round(ge, 3), "text": s["text"]})
+                seg_id += 1
+                last_end = ge
 
         meta["chunks"] += 1
 
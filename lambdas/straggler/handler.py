@@ -0,0 +1,224 @@
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import boto3
+from botocore.exceptions import ClientError
+
+from planner import plan_splits, resolve_winner
+
+S3 = boto3.client("s3")
+BATCH = boto3.client("batch")
+
+JOB_QUEUE = os.getenv("BATCH_JOB_QUEUE_ARN")
+JOB_DEFINITION = os.getenv("BATCH_JOB_DEFINITION_ARN")
+# same resources SubmitBatch gives the parent chunk, so the race is like-for-like
+OVERRIDE_VCPUS = int(os.getenv("BATCH_OVERRIDE_VCPUS", "4"))
+OVERRIDE_MEMORY_MIB = int(os.getenv("BATCH_OVERRIDE_MEMORY_MIB", "10000"))
+
+# -------- S3 / Batch plumbing --------
+def _read_s3_json(bucket: str, key: str) -> Optional[Dict[str, Any]]:
+    try:
+        obj = S3.get_object(Bucket=bucket, Key=key)
+    except ClientError as e:
+        if e.response["Error"]["Code"] in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+    return json.loads(obj["Body"].read().decode("utf-8"))
+
+def _s3_key_exists(bucket: str, key: str) -> bool:
+    try:
+        S3.head_object(Bucket=bucket, Key=key)
+        return True
+    except ClientError as e:
+        if e.response["ResponseMetadata"]["HTTPStatusCode"] == 404 or e.response["Error"]["Code"] in ("404", "NotFound", "NoSuchKey"):
+            return False
+        raise
+
+def _read_manifest(bucket: str, key: str) -> List[Dict[str, Any]]:
+    obj = S3.get_object(Bucket=bucket, Key=key)
+    text = obj["Body"].read().decode("utf-8")
+    entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+    entries.sort(key=lambda x: int(x["index"]))
+    return entries
+
+def _write_manifest(bucket: str, key: str, entries: List[Dict[str, Any]]) -> None:
+    body = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries)
+    S3.put_object(Bucket=bucket, Key=key, Body=body.encode("utf-8"), ContentType="application/json")
+
+def _chunk_prefix(job_id: str, index: int) -> str:
+    # must match OUT_URI in the state machine's SubmitBatch step
+    return f"chunks/{job_id}/{index}/"
+
+def _elapsed_now(progress: Dict[str, Any], now: float) -> Optional[float]:
+    started = progress.get("started_utc")
+    if not started:
+        return progress.get("elapsed_s")
+    return now - datetime.fromisoformat(started).timestamp()
+
+def _load_state(entry: Dict[str, Any], results_bucket: str, now: float) -> Dict[str, Any]:
+    prefix = _chunk_prefix(entry["job_id"], int(entry["index"]))
+    progress = _read_s3_json(results_bucket, prefix + "progress.json") or {}
+    done = _s3_key_exists(results_bucket, prefix + "out.json")
+    return {
+        "start_sec": float(entry["start_sec"]),
+        "end_sec": float(entry["end_sec"]),
+        "elapsed_s": _elapsed_now(progress, now) if progress else None,
+        "audio_done_sec": float(progress.get("audio_done_sec") or 0.0),
+        "done": done,
+        "wall_s": progress.get("elapsed_s") if done else None,
+        "batch_job_id": progress.get("batch_job_id"),
+        "subchunks": entry.get("subchunks"),
+    }
+
+def _submit_subchunk(entry: Dict[str, Any], sc: Dict[str, Any], results_bucket: str, params: Dict[str, Any]) -> str:
+    job_id, idx = entry["job_id"], int(entry["index"])
+    prefix = f"{_chunk_prefix(job_id, idx)}sub-{sc['sub_index']}/"
+    in_uri = entry.get("in_uri") or entry["s3_uri"]
+    c_start = float(entry["start_sec"])
+    env = {
+        "IN_URI": in_uri,
+        "OUT_URI": f"s3://{results_bucket}/{prefix}out.json",
+        "OUT_BUCKET": results_bucket,
+        "OUT_PREFIX": prefix,
+        "RESULTS_PREFIX": prefix,
+        # window is chunk-relative: the worker clips the parent chunk's audio
+        "CLIP_START": f"{sc['start_sec'] - c_start:.3f}",
+        "CLIP_END": f"{sc['end_sec'] - c_start:.3f}",
+        "MODEL": params.get("model") or "large-v3",
+        "LANGUAGE": params.get("language") or "",
+        "COMPUTE_TYPE": params.get("compute_type") or "int8_float16",
+        "BEAM_SIZE": str(params.get("beam_size") or 5),
+        "VAD": str(params.get("vad") or ""),
+    }
+    resp = BATCH.submit_job(
+        jobName=f"whisper-{job_id}-{idx}-s{sc['sub_index']}",
+        jobQueue=JOB_QUEUE,
+        jobDefinition=JOB_DEFINITION,
+        containerOverrides={
+            "vcpus": OVERRIDE_VCPUS,
+            "memory": OVERRIDE_MEMORY_MIB,
+            "environment": [{"name": k, "value": v} for k, v in env.items()],
+        },
+    )
+    return resp["jobId"]
+
+def _terminate(batch_job_ids: List[Optional[str]], reason: str) -> None:
+    for jid in batch_job_ids:
+        if not jid:
+            continue
+        try:
+            BATCH.terminate_job(jobId=jid, reason=reason)
+        except ClientError as e:
+            # already finished / gone, or throttled; the next tick settles the race again
+            print(f"[straggler] terminate {jid} failed: {e}")
+
+def _unknown_state(entry: Dict[str, Any]) -> Dict[str, Any]:
+    # progress unreadable this tick: keep the chunk pending and out of split planning
+    return {
+        "start_sec": float(entry["start_sec"]),
+        "end_sec": float(entry["end_sec"]),
+        "elapsed_s": None,
+        "audio_done_sec": 0.0,
+        "done": False,
+        "wall_s": None,
+        "batch_job_id": None,
+        "subchunks": entry.get("subchunks"),
+    }
+
+def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """
+    One controller tick. The state machine's StragglerTick loop runs alongside
+    FanOutTranscribes and repeats this until it returns done=true.
+    The controller is only an optimisation: S3/Batch errors on a chunk are logged and that
+    chunk is skipped until the next tick, rather than failing the transcription.
+    Expected event keys (from Step Functions input):
+      - manifest_bucket
+      - manifest_key
+      - results_bucket
+      - model, language, compute_type, beam_size, vad  (forwarded to sub-chunk jobs)
+    """
+    manifest_bucket = event["manifest_bucket"]
+    manifest_key = event["manifest_key"]
+    results_bucket = event["results_bucket"]
+    now = time.time()
+
+    entries = _read_manifest(manifest_bucket, manifest_key)
+    by_index = {int(e["index"]): e for e in entries}
+    states: Dict[int, Dict[str, Any]] = {}
+    for idx, e in by_index.items():
+        try:
+            states[idx] = _load_state(e, results_bucket, now)
+        except ClientError as err:
+            print(f"[straggler] chunk {idx}: progress unreadable, skipping this tick: {err}")
+            states[idx] = _unknown_state(e)
+    changed = False
+
+    # 1) settle races on chunks that were already split
+    for idx, entry in by_index.items():
+        if not entry.get("subchunks") or entry.get("winner"):
+            continue
+        prefix = _chunk_prefix(entry["job_id"], idx)
+        try:
+            subs_done = [_s3_key_exists(results_bucket, f"{prefix}sub-{sc['sub_index']}/out.json") for sc in entry["subchunks"]]
+        except ClientError as err:
+            print(f"[straggler] chunk {idx}: sub-chunk status unreadable, skipping this tick: {err}")
+            continue
+        winner = resolve_winner(states[idx]["done"], subs_done)
+        if winner == "parent":
+            _terminate([sc.get("batch_job_id") for sc in entry["subchunks"]], "straggler: parent finished first")
+        elif winner == "subchunks":
+            _terminate([states[idx]["batch_job_id"]], "straggler: sub-chunks finished first")
+        if winner:
+            entry["winner"] = winner
+            changed = True
+
+    # 2) split new stragglers
+    plans = []
+    submitted: List[Optional[str]] = []
+    for plan in plan_splits(states):
+        entry = by_index[plan["index"]]
+        try:
+            for sc in plan["subchunks"]:
+                sc["batch_job_id"] = _submit_subchunk(entry, sc, results_bucket, event)
+        except (ClientError, KeyError) as err:
+            # don't leave half a split racing the parent; it is re-planned next tick
+            print(f"[straggler] chunk {plan['index']}: split failed, skipping this tick: {err!r}")
+            _terminate([sc.get("batch_job_id") for sc in plan["subchunks"]], "straggler: split abandoned")
+            continue
+        plans.append(plan)
+        submitted.extend(sc["batch_job_id"] for sc in plan["subchunks"])
+        entry["split_at_sec"] = plan["split_at_sec"]
+        entry["subchunks"] = plan["subchunks"]
+        entry["winner"] = None
+        changed = True
+        print(f"[straggler] split chunk {plan['index']} at {plan['split_at_sec']}s "
+              f"(projected {plan['projected_wall_s']}s vs median {plan['median_wall_s']}s)")
+
+    write_failed = False
+    if changed:
+        try:
+            _write_manifest(manifest_bucket, manifest_key, entries)
+        except ClientError as err:
+            # unrecorded sub-chunks would never be stitched or settled; winners are re-derived next tick
+            print(f"[straggler] manifest write failed, undoing this tick's splits: {err}")
+            _terminate(submitted, "straggler: split abandoned")
+            write_failed = True
+            plans = []
+            for e in entries:
+                if e.get("subchunks") and any(sc.get("batch_job_id") in submitted for sc in e["subchunks"]):
+                    for k in ("split_at_sec", "subchunks", "winner"):
+                        e.pop(k, None)
+
+    pending = [
+        idx for idx, e in by_index.items()
+        if not states[idx]["done"] and not (e.get("subchunks") and e.get("winner") == "subchunks")
+    ]
+    return {
+        "splits": [{"index": p["index"], "split_at_sec": p["split_at_sec"]} for p in plans],
+        "pending": pending,
+        # never report done on a tick whose winners did not reach the manifest
+        "done": not pending and not write_failed,
+    }
@@ -0,0 +1,176 @@
+"""
+Straggler decision logic and a local simulation. Deliberately free of boto3 so the
+simulation (stub transcriber, injected delays) and the tests run without AWS.
+"""
+import argparse
+import json
+import math
+import os
+import statistics
+from typing import Any, Dict, List, Optional, Tuple
+
+# Tunables
+THRESHOLD = float(os.getenv("STRAGGLER_THRESHOLD", "1.5"))               # projected finish > median * THRESHOLD
+MIN_ELAPSED_SEC = float(os.getenv("STRAGGLER_MIN_ELAPSED_SECONDS", "120"))  # don't judge a chunk before this
+MIN_REMAINING_SEC = float(os.getenv("STRAGGLER_MIN_REMAINING_SECONDS", "60"))  # not worth splitting below this
+SPLIT_WAYS = int(os.getenv("STRAGGLER_SPLIT_WAYS", "2"))
+OVERLAP_SEC = float(os.getenv("OVERLAP_SECONDS", "1.0"))
+EPS = 1e-6
+
+def projected_wall(state: Dict[str, Any]) -> Optional[float]:
+    """
+    state: {"start_sec", "end_sec", "elapsed_s", "audio_done_sec", "done", "wall_s", "subchunks"}
+    Projects total wall time from segment timestamps versus wall time so far.
+    Returns None while there is not enough signal to judge the chunk.
+    """
+    if state.get("done"):
+        return state.get("wall_s")
+    elapsed = state.get("elapsed_s")
+    if elapsed is None or elapsed < MIN_ELAPSED_SEC:
+        return None
+    span = state["end_sec"] - state["start_sec"]
+    done_sec = min(state.get("audio_done_sec") or 0.0, span)
+    if done_sec <= EPS:
+        return math.inf
+    rate = done_sec / elapsed
+    return elapsed + (span - done_sec) / rate
+
+def split_windows(chunk_start: float, split_at: float, end: float,
+                  ways: int = SPLIT_WAYS, overlap: float = OVERLAP_SEC) -> List[Tuple[float, float]]:
+    """
+    Cut [split_at, end] into `ways` windows, each overlapping its predecessor by `overlap`
+    (the first also reaches back into the parent's already-transcribed audio, but never
+    before chunk_start, since sub-chunks clip the parent chunk's audio).
+    """
+    step = (end - split_at) / ways
+    windows = []
+    for i in range(ways):
+        w_start = max(chunk_start, split_at + i * step - overlap)
+        w_end = end if i == ways - 1 else split_at + (i + 1) * step
+        windows.append((round(w_start, 3), round(w_end, 3)))
+    return windows
+
+def plan_splits(states: Dict[int, Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    states: {index: state} for every chunk in the job (see projected_wall).
+    Returns [{"index", "split_at_sec", "subchunks": [...]}] for running chunks whose projected
+    finish exceeds the job median by THRESHOLD and which have not been split already.
+    """
+    projected = {idx: projected_wall(st) for idx, st in states.items()}
+    known = [p for p in projected.values() if p is not None and math.isfinite(p)]
+    if len(known) < 2:
+        return []
+    median = statistics.median(known)
+
+    plans: List[Dict[str, Any]] = []
+    for idx, st in sorted(states.items()):
+        p = projected[idx]
+        if st.get("done") or st.get("subchunks") or p is None or p <= median * THRESHOLD:
+            continue
+        split_at = st["start_sec"] + min(st.get("audio_done_sec") or 0.0, st["end_sec"] - st["start_sec"])
+        if st["end_sec"] - split_at < MIN_REMAINING_SEC:
+            continue
+        plans.append({
+            "index": idx,
+            "split_at_sec": round(split_at, 3),
+            "projected_wall_s": round(p, 1) if math.isfinite(p) else None,
+            "median_wall_s": round(median, 1),
+            "subchunks": [
+                {"sub_index": k, "start_sec": w_start, "end_sec": w_end}
+                for k, (w_start, w_end) in enumerate(split_windows(st["start_sec"], split_at, st["end_sec"]))
+            ],
+        })
+    return plans
+
+def resolve_winner(parent_done: bool, subs_done: List[bool]) -> Optional[str]:
+    # The parent keeps running after a split; whichever side completes first wins.
+    if parent_done:
+        return "parent"
+    if subs_done and all(subs_done):
+        return "subchunks"
+    return None
+
+# -------- Local simulation (stub transcriber, injected delays; no AWS) --------
+class _StubJob:
+    """Transcribes [start_sec, end_sec] at `rate` audio-seconds per wall-second after `startup_s`."""
+
+    def __init__(self, start_sec: float, end_sec: float, rate: float, submitted_at: float, startup_s: float):
+        self.start_sec = start_sec
+        self.end_sec = end_sec
+        self.rate = rate
+        self.begin = submitted_at + startup_s
+
+    def audio_done(self, t: float) -> float:
+        return max(0.0, min(self.end_sec - self.start_sec, (t - self.begin) * self.rate))
+
+    def finish_at(self) -> float:
+        return self.begin + (self.end_sec - self.start_sec) / self.rate
+
+def simulate(n_chunks: int, chunk_sec: float, rate: float, delays: Dict[int, float],
+             tick_s: float, startup_s: float) -> Dict[str, Any]:
+    parents = {
+        i: _StubJob(i * chunk_sec, (i + 1) * chunk_sec, rate / delays.get(i, 1.0), 0.0, startup_s)
+        for i in range(n_chunks)
+    }
+    subs: Dict[int, List[_StubJob]] = {}
+    manifest = [{"index": i, "start_sec": j.start_sec, "end_sec": j.end_sec} for i, j in parents.items()]
+    by_index = {e["index"]: e for e in manifest}
+
+    t = 0.0
+    while True:
+        t += tick_s
+        states = {}
+        for i, job in parents.items():
+            done = job.finish_at() <= t
+            states[i] = {
+                "start_sec": job.start_sec,
+                "end_sec": job.end_sec,
+                "elapsed_s": t,
+                "audio_done_sec": job.audio_done(t),
+                "done": done,
+                "wall_s": job.finish_at() if done else None,
+                "subchunks": by_index[i].get("subchunks"),
+            }
+        for i, entry in by_index.items():
+            if entry.get("subchunks") and not entry.get("winner"):
+                winner = resolve_winner(states[i]["done"], [s.finish_at() <= t for s in subs[i]])
+                if winner:
+                    entry["winner"] = winner
+                    entry["finished_at_s"] = round(min(parents[i].finish_at(), max(s.finish_at() for s in subs[i])), 1)
+        for plan in plan_splits(states):
+            entry = by_index[plan["index"]]
+            entry.update({"split_at_sec": plan["split_at_sec"], "subchunks": plan["subchunks"], "winner": None})
+            subs[plan["index"]] = [_StubJob(sc["start_sec"], sc["end_sec"], rate, t, startup_s) for sc in plan["subchunks"]]
+        if all(st["done"] or by_index[i].get("winner") for i, st in states.items()):
+            break
+
+    def finished(i: int) -> float:
+        if by_index[i].get("winner") == "subchunks":
+            return by_index[i]["finished_at_s"]
+        return parents[i].finish_at()
+
+    return {
+        "baseline_makespan_s": round(max(j.finish_at() for j in parents.values()), 1),
+        "makespan_s": round(max(finished(i) for i in parents), 1),
+        "manifest": manifest,
+    }
+
+def _parse_delays(items: List[str]) -> Dict[int, float]:
+    out: Dict[int, float] = {}
+    for item in items:
+        idx, factor = item.split("=", 1)
+        out[int(idx)] = float(factor)
+    return out
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local straggler simulation with a stub transcriber")
+    parser.add_argument("--chunks", type=int, default=6)
+    parser.add_argument("--chunk-sec", type=float, default=600.0)
+    parser.add_argument("--rate", type=float, default=10.0, help="Stub speed in audio-seconds per wall-second")
+    parser.add_argument("--delay", action="append", default=[], help="Inject slowdown, e.g. --delay 3=4 (chunk 3 runs 4x slower)")
+    parser.add_argument("--tick", type=float, default=15.0, help="Controller tick interval (s)")
+    parser.add_argument("--startup", type=float, default=30.0, help="Simulated container start + model load (s)")
+    args = parser.parse_args()
+    res = simulate(args.chunks, args.chunk_sec, args.rate, _parse_delays(args.delay), args.tick, args.startup)
+    print(json.dumps(res, indent=2))
+
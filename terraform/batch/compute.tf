@@ -32,19 +32,56 @@ resource "aws_batch_compute_environment" "gpu_env" {
 
     # must be the *instance profile* ARN
     instance_role = aws_iam_instance_profile.ecs_instance_profile.arn
+
+    launch_template {
+      launch_template_id = aws_launch_template.batch_gpu.id
+      version            = aws_launch_template.batch_gpu.latest_version
+    }
   }
 }
 
+# Fill the host-mounted shared model cache before the instance joins ECS
+# (the ECS agent starts after cloud-final), so workers running with
+# WHISPER_OFFLINE=1 always find verified weights at /models/shared.
+resource "aws_launch_template" "batch_gpu" {
+  name_prefix            = "batch-gpu-"
+  update_default_version = true
+
+  user_data = base64encode(<<-EOT
+    MIME-Version: 1.0
+    Content-Type: multipart/mixed; boundary="==BOUNDARY=="
+
+    --==BOUNDARY==
+    Content-Type: text/x-shellscript; charset="us-ascii"
 
-# (Optional) If you decide you need a bigger root volume later:
-# resource "aws_launch_template" "batch_gpu" {
-#   name_prefix   = "batch-gpu-"
-#   update_default_version = true
-#   block_device_mappings {
-#     device_name = "/dev/xvda"
-#     ebs {
-#       volume_size = 100
-#       volume_type = "gp3"
-#     }
-#   }
-# }
+    #!/bin/bash
+    set -euo pipefail
+    mkdir -p ${var.model_cache_host_path}
+    if [ -n "${var.model_cache_prefetch_model}" ]; then
+      command -v aws >/dev/null || yum install -y awscli
+      systemctl start docker
+      aws ecr get-login-password --region ${var.region} \
+        | docker login --username AWS --password-stdin ${split("/", var.ecr_image_uri)[0]}
+      CACHE_RUN="docker run --rm --entrypoint python3 -e WHISPER_SHARED_CACHE=/models/shared -v ${var.model_cache_host_path}:/models/shared"
+      # skip when the image already has the weights baked in, or the host cache is warm
+      if ! $CACHE_RUN ${var.ecr_image_uri} /app/model_cache.py verify --model ${var.model_cache_prefetch_model} --mode size; then
+        # the image defaults to offline; this is the one step allowed to reach the network
+        $CACHE_RUN -e WHISPER_OFFLINE=0 -e HF_HUB_OFFLINE=0 ${var.ecr_image_uri} \
+          /app/model_cache.py prefetch --model ${var.model_cache_prefetch_model} --root /models/shared
+      fi
+    fi
+    --==BOUNDARY==--
+  EOT
+  )
+
+  # If you decide you need a bigger root volume later:
+  # block_device_mappings {
+  #   device_name = "/dev/xvda"
+  #   ebs {
+  #     volume_size = 100
+  #     volume_type = "gp3"
+  #   }
+  # }
+
+  tags = local.tags
+}
@@ -25,7 +25,8 @@ resource "aws_batch_job_definition" "whisper_job" {
       { name = "COMPUTE_TYPE", value = "int8_float16" },
       { name = "CHUNK_S3_URI", value = "" },
       { name = "RESULTS_BUCKET", value = "" },
-      { name = "RESULTS_PREFIX", value = "chunks/" }
+      { name = "RESULTS_PREFIX", value = "chunks/" },
+      { name = "WHISPER_SHARED_CACHE", value = "/models/shared" }
     ]
 
     logConfiguration = {
@@ -40,8 +41,12 @@ resource "aws_batch_job_definition" "whisper_job" {
     readonlyRootFilesystem = false
     privileged             = false
     ulimits                = []
-    volumes                = []
-    mountPoints            = []
+    volumes = [
+      { name = "whisper-cache", host = { sourcePath = var.model_cache_host_path } }
+    ]
+    mountPoints = [
+      { sourceVolume = "whisper-cache", containerPath = "/models/shared", readOnly = false }
+    ]
   })
 
   retry_strategy {
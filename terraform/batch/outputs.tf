@@ -21,3 +21,8 @@ output "job_queue_arn" {
 output "job_definition_arn" {
   value = aws_batch_job_definition.whisper_job.arn
 }
+
+# stepfunctions / straggler-lambda resolve the latest ACTIVE revision by this name
+output "job_definition_name" {
+  value = aws_batch_job_definition.whisper_job.name
+}
@@ -24,3 +24,15 @@ variable "ecr_image_uri" {
   description = "Full ECR image URI for whisper-faster:latest"
   type        = string
 }
+
+variable "model_cache_host_path" {
+  description = "Host directory mounted into every whisper container as the shared model cache"
+  type        = string
+  default     = "/opt/whisper-cache"
+}
+
+variable "model_cache_prefetch_model" {
+  description = "Model prefetched into model_cache_host_path at instance boot (empty skips)"
+  type        = string
+  default     = "large-v3"
+}
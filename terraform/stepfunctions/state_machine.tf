@@ -1,10 +1,25 @@
+# Latest ACTIVE revision of the job definition terraform/batch manages, so a new revision
+# (env/mounts) reaches these jobs on the next apply instead of staying on a stale pin.
+data "aws_batch_job_definition" "whisper" {
+  count  = var.batch_job_definition_arn == "" ? 1 : 0
+  name   = var.batch_job_definition_name
+  status = "ACTIVE"
+}
+
 locals {
+  batch_job_definition_arn = var.batch_job_definition_arn != "" ? var.batch_job_definition_arn : data.aws_batch_job_definition.whisper[0].arn
+
   asl_definition = templatefile("${path.module}/state_machine.asl.json.tftpl", {
     batch_job_queue_arn       = var.batch_job_queue_arn
-    batch_job_definition_arn  = var.batch_job_definition_arn
+    batch_job_definition_arn  = local.batch_job_definition_arn
     map_max_concurrency       = var.map_max_concurrency
     batch_override_vcpus      = var.batch_override_vcpus
     batch_override_memory_mib = var.batch_override_memory_mib
+    ingest_bucket_name        = var.ingest_bucket_name
+    results_bucket_name       = var.results_bucket_name
+    stitcher_lambda_arn       = var.stitcher_lambda_arn
+    straggler_lambda_arn      = var.straggler_lambda_arn
+    straggler_tick_seconds    = var.straggler_tick_seconds
   })
 }
 
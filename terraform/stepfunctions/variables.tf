@@ -43,9 +43,16 @@ variable "batch_job_queue_arn" {
   type        = string
 }
 
+variable "batch_job_definition_name" {
+  description = "AWS Batch Job Definition name (from Phase 3, terraform/batch)"
+  type        = string
+  default     = "whisper-transcribe-job"
+}
+
 variable "batch_job_definition_arn" {
-  description = "AWS Batch Job Definition ARN (from Phase 3)"
+  description = "Optional revision-pinned Job Definition ARN; empty uses the latest ACTIVE revision of batch_job_definition_name"
   type        = string
+  default     = ""
 }
 
 variable "batch_override_vcpus" {
@@ -59,3 +66,19 @@ variable "batch_override_memory_mib" {
   type        = number
   default     = 10000
 }
+
+variable "stitcher_lambda_arn" {
+  description = "ARN of the stitcher Lambda (from stitcher-lambda)"
+  type        = string
+}
+
+variable "straggler_lambda_arn" {
+  description = "ARN of the straggler controller Lambda (from straggler-lambda)"
+  type        = string
+}
+
+variable "straggler_tick_seconds" {
+  description = "Seconds between straggler controller ticks while chunks are transcribing"
+  type        = number
+  default     = 60
+}
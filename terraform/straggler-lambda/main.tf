@@ -0,0 +1,149 @@
+terraform {
+  required_version = ">= 1.5.0"
+
+  required_providers {
+    aws = {
+      source  = "hashicorp/aws"
+      version = ">= 5.41" # aws_batch_job_definition data source
+    }
+  }
+}
+
+provider "aws" {
+  region = var.region
+}
+
+locals {
+  tags = {
+    Project = var.project
+    Stack   = "straggler-lambda"
+  }
+
+  # Path to prebuilt zip in artifacts/lambda/ (flat: handler.py + planner.py)
+  function_zip_abs = abspath("${path.module}/../../artifacts/lambda/straggler.zip")
+}
+
+# Latest ACTIVE revision of the job definition terraform/batch manages, so a new revision
+# (env/mounts) reaches these jobs on the next apply instead of staying on a stale pin.
+data "aws_batch_job_definition" "whisper" {
+  count  = var.batch_job_definition_arn == "" ? 1 : 0
+  name   = var.batch_job_definition_name
+  status = "ACTIVE"
+}
+
+locals {
+  batch_job_definition_arn = var.batch_job_definition_arn != "" ? var.batch_job_definition_arn : data.aws_batch_job_definition.whisper[0].arn
+}
+
+# --- IAM role for Lambda ---
+data "aws_iam_policy_document" "lambda_trust" {
+  statement {
+    actions = ["sts:AssumeRole"]
+    principals {
+      type        = "Service"
+      identifiers = ["lambda.amazonaws.com"]
+    }
+  }
+}
+
+resource "aws_iam_role" "straggler_role" {
+  name               = "whisper-straggler-lambda-role"
+  assume_role_policy = data.aws_iam_policy_document.lambda_trust.json
+  tags               = local.tags
+}
+
+data "aws_iam_policy_document" "access" {
+  statement {
+    sid       = "Logs"
+    actions   = ["logs:CreateLogGroup", "logs:CreateLogStream", "logs:PutLogEvents"]
+    resources = ["arn:aws:logs:*:*:*"]
+  }
+
+  # Manifest is rewritten with nested sub-chunk entries
+  statement {
+    sid     = "ReadWriteManifest"
+    actions = ["s3:GetObject", "s3:PutObject"]
+    resources = [
+      "arn:aws:s3:::${var.manifest_bucket}/${var.manifest_prefix}*"
+    ]
+  }
+
+  # progress.json / out.json polling (ListBucket turns missing keys into 404 instead of 403)
+  statement {
+    sid     = "ReadChunkProgress"
+    actions = ["s3:GetObject", "s3:ListBucket"]
+    resources = [
+      "arn:aws:s3:::${var.results_bucket}",
+      "arn:aws:s3:::${var.results_bucket}/${var.chunks_prefix}*"
+    ]
+  }
+
+  statement {
+    sid     = "SubmitSubChunks"
+    actions = ["batch:SubmitJob"]
+    resources = [
+      var.batch_job_queue_arn,
+      local.batch_job_definition_arn,
+      # SubmitJob is authorised against the unversioned definition ARN too
+      replace(local.batch_job_definition_arn, "/:[0-9]+$/", "")
+    ]
+  }
+
+  statement {
+    sid       = "TerminateLosers"
+    actions   = ["batch:TerminateJob"]
+    resources = ["arn:aws:batch:${var.region}:${var.account_id}:job/*"]
+  }
+}
+
+resource "aws_iam_policy" "access" {
+  name   = "whisper-straggler-access"
+  policy = data.aws_iam_policy_document.access.json
+}
+
+resource "aws_iam_role_policy_attachment" "access_attach" {
+  role       = aws_iam_role.straggler_role.name
+  policy_arn = aws_iam_policy.access.arn
+}
+
+# --- Lambda function ---
+resource "aws_lambda_function" "straggler" {
+  function_name = "whisper-straggler"
+  role          = aws_iam_role.straggler_role.arn
+  runtime       = "python3.11"
+
+  # Flat zip -> handler.py at zip root
+  handler          = "handler.handler"
+  filename         = local.function_zip_abs
+  source_code_hash = filebase64sha256(local.function_zip_abs)
+
+  timeout     = 60
+  memory_size = 256
+  publish     = true
+
+  environment {
+    variables = {
+      BATCH_JOB_QUEUE_ARN             = var.batch_job_queue_arn
+      BATCH_JOB_DEFINITION_ARN        = local.batch_job_definition_arn
+      BATCH_OVERRIDE_VCPUS            = tostring(var.batch_override_vcpus)
+      BATCH_OVERRIDE_MEMORY_MIB       = tostring(var.batch_override_memory_mib)
+      STRAGGLER_THRESHOLD             = tostring(var.straggler_threshold)
+      STRAGGLER_MIN_ELAPSED_SECONDS   = "120"
+      STRAGGLER_MIN_REMAINING_SECONDS = "60"
+      STRAGGLER_SPLIT_WAYS            = tostring(var.straggler_split_ways)
+      OVERLAP_SECONDS                 = "1.0"
+    }
+  }
+
+  tags = local.tags
+}
+
+# Allow Step Functions to invoke Lambda
+resource "aws_lambda_permission" "allow_sfn" {
+  count         = var.state_machine_arn == "" ? 0 : 1
+  statement_id  = "AllowSFNInvoke"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.straggler.function_name
+  principal     = "states.amazonaws.com"
+  source_arn    = var.state_machine_arn
+}
@@ -0,0 +1,6 @@
+output "lambda_name" {
+  value = aws_lambda_function.straggler.function_name
+}
+output "lambda_arn" {
+  value = aws_lambda_function.straggler.arn
+}
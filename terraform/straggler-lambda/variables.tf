@@ -0,0 +1,74 @@
+variable "region" {
+  type = string
+}
+
+variable "account_id" {
+  type = string
+}
+
+variable "project" {
+  type    = string
+  default = "seerahscribe"
+}
+
+variable "manifest_bucket" {
+  type = string
+}
+
+variable "results_bucket" {
+  type = string
+}
+
+# Prefixes with trailing slashes
+variable "manifest_prefix" {
+  type    = string
+  default = "manifests/"
+}
+
+variable "chunks_prefix" {
+  type    = string
+  default = "chunks/"
+}
+
+# Sub-chunk jobs race the parent on the same queue/definition/resources as SubmitBatch
+variable "batch_job_queue_arn" {
+  type = string
+}
+
+variable "batch_job_definition_name" {
+  type    = string
+  default = "whisper-transcribe-job"
+}
+
+# Optional revision pin; empty uses the latest ACTIVE revision of batch_job_definition_name
+variable "batch_job_definition_arn" {
+  type    = string
+  default = ""
+}
+
+variable "batch_override_vcpus" {
+  type    = number
+  default = 4
+}
+
+variable "batch_override_memory_mib" {
+  type    = number
+  default = 10000
+}
+
+# Split when projected finish > median * threshold
+variable "straggler_threshold" {
+  type    = number
+  default = 1.5
+}
+
+variable "straggler_split_ways" {
+  type    = number
+  default = 2
+}
+
+# Step Functions that will call this Lambda
+variable "state_machine_arn" {
+  type    = string
+  default = ""
+}
@@ -0,0 +1,12 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lambdas ship as flat zips, so import them the same way they run
+sys.path.insert(0, os.path.join(ROOT, "lambdas"))
+sys.path.insert(0, os.path.join(ROOT, "lambdas", "straggler"))
+sys.path.insert(0, os.path.join(ROOT, "docker", "whisper-worker", "app"))
+
+# handler modules create boto3 clients at import time
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
@@ -0,0 +1,52 @@
+import os
+
+import pytest
+
+import model_cache
+
+
+@pytest.fixture
+def roots(tmp_path, monkeypatch):
+    image, shared = tmp_path / "image", tmp_path / "shared"
+    monkeypatch.setenv("WHISPER_CACHE", str(image))
+    monkeypatch.setenv("WHISPER_SHARED_CACHE", str(shared))
+    monkeypatch.setenv("WHISPER_OFFLINE", "1")
+    return image, shared
+
+
+def _bake(root, model="large-v3", payload=b"weights"):
+    model_dir = root / "models--x" / "snapshots" / "rev"
+    model_dir.mkdir(parents=True)
+    (model_dir / "model.bin").write_bytes(payload)
+    model_cache.write_manifest(str(root), model, str(model_dir))
+    return str(model_dir)
+
+
+def test_resolves_verified_model(roots):
+    image, _ = roots
+    model_dir = _bake(image)
+    assert model_cache.resolve_model("large-v3", "full") == model_dir
+
+
+def test_full_verify_detects_corruption(roots):
+    image, _ = roots
+    model_dir = _bake(image)
+    with open(os.path.join(model_dir, "model.bin"), "wb") as f:
+        f.write(b"weightz")
+    with pytest.raises(model_cache.ModelCacheError):
+        model_cache.resolve_model("large-v3", "full")
+
+
+def test_truncated_manifest_falls_through_to_next_root(roots):
+    image, shared = roots
+    _bake(image)
+    manifest = model_cache._manifest_path(str(image), "large-v3")
+    with open(manifest, "r+", encoding="utf-8") as f:
+        f.truncate(10)
+    shared_dir = _bake(shared)
+    assert model_cache.resolve_model("large-v3", "size") == shared_dir
+
+
+def test_offline_miss_fails_fast(roots):
+    with pytest.raises(model_cache.ModelCacheError, match="WHISPER_OFFLINE=1"):
+        model_cache.resolve_model("large-v3")
@@ -0,0 +1,116 @@
+import json
+
+import pytest
+
+from stitcher import handler as stitcher
+
+
+@pytest.fixture
+def store(monkeypatch):
+    objects = {}
+
+    class _S3:
+        def list_objects_v2(self, Bucket, Prefix):
+            return {"Contents": [{"Key": k} for k in objects if k.startswith(Prefix)]}
+
+    monkeypatch.setattr(stitcher, "S3", _S3())
+    monkeypatch.setattr(stitcher, "_s3_key_exists", lambda bucket, key: key in objects)
+    monkeypatch.setattr(stitcher, "_read_s3_json", lambda bucket, key: objects[key])
+    return objects
+
+
+def _segs(*triples):
+    return {"segments": [{"start": s, "end": e, "text": t} for s, e, t in triples]}
+
+
+def _manifest(*entries):
+    return stitcher._parse_manifest_jsonl("\n".join(json.dumps(e) for e in entries))
+
+
+SPLIT_ENTRY = {
+    "index": 1, "start_sec": 9.0, "end_sec": 20.0, "split_at_sec": 14.0, "winner": "subchunks",
+    "subchunks": [
+        {"sub_index": 1, "start_sec": 16.0, "end_sec": 20.0},
+        {"sub_index": 0, "start_sec": 13.0, "end_sec": 17.0},
+    ],
+}
+
+
+def test_parse_nested_subchunks():
+    entry = _manifest(SPLIT_ENTRY)[0]
+    assert entry["split_at_sec"] == 14.0
+    assert entry["winner"] == "subchunks"
+    assert [sc["sub_index"] for sc in entry["subchunks"]] == [0, 1]
+
+
+def test_parse_plain_entry_has_no_split_keys():
+    entry = _manifest({"index": 0, "start_sec": 0, "end_sec": 10, "s3_uri": "s3://b/k"})[0]
+    assert entry == {"index": 0, "start_sec": 0.0, "end_sec": 10.0}
+
+
+def test_joins_parent_progress_with_subchunks(store):
+    store["chunks/j/0/out.json"] = _segs((0, 5, "a"), (5, 10, "b"))
+    store["chunks/j/1/progress.json"] = _segs((0, 4, "c"), (4, 6, "past-split"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "d"))
+    store["chunks/j/1/sub-1/out.json"] = _segs((0, 4, "e"))
+
+    segments, meta = stitcher._merge_segments(
+        _manifest({"index": 0, "start_sec": 0, "end_sec": 10}, SPLIT_ENTRY), "b", "j")
+
+    assert [(s["start"], s["end"], s["text"]) for s in segments] == [
+        (0.0, 5.0, "a"),
+        (5.0, 10.0, "b"),
+        (10.0, 13.0, "c"),
+        (13.0, 14.0, "past-split"),  # parent partial is clamped at split_at_sec
+        (14.0, 16.0, "d"),
+        (16.0, 20.0, "e"),
+    ]
+    assert meta["resplit_chunks"] == 1
+    assert meta["missing_subchunks"] == 0
+
+
+def test_parent_winner_ignores_subchunks(store):
+    store["chunks/j/1/out.json"] = _segs((0, 11, "parent"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "sub"))
+    segments, meta = stitcher._merge_segments(_manifest(dict(SPLIT_ENTRY, winner="parent")), "b", "j")
+    assert [s["text"] for s in segments] == ["parent"]
+    assert meta["resplit_chunks"] == 0
+
+
+def test_missing_subchunk_falls_back_to_parent(store):
+    store["chunks/j/1/out.json"] = _segs((0, 11, "parent"))
+    store["chunks/j/1/progress.json"] = _segs((0, 4, "c"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "d"))
+    segments, meta = stitcher._merge_segments(_manifest(SPLIT_ENTRY), "b", "j")
+    assert [s["text"] for s in segments] == ["parent"]
+    assert meta["missing_subchunks"] == 0
+
+
+def test_missing_subchunk_without_parent_is_counted(store):
+    store["chunks/j/1/progress.json"] = _segs((0, 4, "c"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "d"))
+    segments, meta = stitcher._merge_segments(_manifest(SPLIT_ENTRY), "b", "j")
+    assert [s["text"] for s in segments] == ["c", "d"]
+    assert meta["missing_subchunks"] == 1
+
+
+def test_resplit_parent_lookup_ignores_other_chunks(store):
+    # chunk 0 is the only plain out.json under the job; it must not stand in for chunk 1's parent
+    store["chunks/j/0/out.json"] = _segs((0, 5, "a"), (5, 9, "b"))
+    store["chunks/j/1/progress.json"] = _segs((0, 4, "c"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "d"))
+    segments, meta = stitcher._merge_segments(
+        _manifest({"index": 0, "start_sec": 0, "end_sec": 9}, SPLIT_ENTRY), "b", "j")
+    assert [s["text"] for s in segments] == ["a", "b", "c", "d"]
+    assert meta["missing_subchunks"] == 1
+
+
+def test_undecided_resplit_without_parent_uses_subchunks(store):
+    store["chunks/j/0/out.json"] = _segs((0, 9, "a"))
+    store["chunks/j/1/progress.json"] = _segs((0, 4, "c"))
+    store["chunks/j/1/sub-0/out.json"] = _segs((0, 3, "d"))
+    store["chunks/j/1/sub-1/out.json"] = _segs((0, 4, "e"))
+    segments, meta = stitcher._merge_segments(
+        _manifest({"index": 0, "start_sec": 0, "end_sec": 9}, dict(SPLIT_ENTRY, winner=None)), "b", "j")
+    assert [s["text"] for s in segments] == ["a", "c", "d", "e"]
+    assert meta["resplit_chunks"] == 1
@@ -0,0 +1,212 @@
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from botocore.exceptions import ClientError
+
+import handler as straggler
+
+JOB = "j"
+NOW = datetime.now(timezone.utc)
+
+
+def _client_error(code, status=400):
+    return ClientError({"Error": {"Code": code}, "ResponseMetadata": {"HTTPStatusCode": status}}, "op")
+
+
+class _S3:
+    def __init__(self):
+        self.objects = {}
+        self.fail_head = set()
+        self.fail_put = False
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            raise _client_error("NoSuchKey", 404)
+        return {"Body": io.BytesIO(self.objects[Key].encode("utf-8"))}
+
+    def head_object(self, Bucket, Key):
+        if Key in self.fail_head:
+            raise _client_error("SlowDown", 503)
+        if Key not in self.objects:
+            raise _client_error("404", 404)
+        return {}
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        if self.fail_put:
+            raise _client_error("SlowDown", 503)
+        self.objects[Key] = Body.decode("utf-8")
+
+
+class _Batch:
+    def __init__(self):
+        self.submitted = []
+        self.terminated = []
+        self.fail_submit_after = None
+
+    def submit_job(self, **kwargs):
+        if self.fail_submit_after is not None and len(self.submitted) >= self.fail_submit_after:
+            raise _client_error("TooManyRequestsException", 429)
+        self.submitted.append(kwargs)
+        return {"jobId": f"sub-job-{len(self.submitted)}"}
+
+    def terminate_job(self, jobId, reason):
+        self.terminated.append((jobId, reason))
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    s3, batch = _S3(), _Batch()
+    monkeypatch.setattr(straggler, "S3", s3)
+    monkeypatch.setattr(straggler, "BATCH", batch)
+    return s3, batch
+
+
+EVENT = {
+    "manifest_bucket": "ingest",
+    "manifest_key": f"manifests/{JOB}.jsonl",
+    "results_bucket": "results",
+    "model": "large-v3",
+    "language": "en",
+    "compute_type": "int8_float16",
+    "beam_size": 5,
+    "vad": 1,
+}
+
+
+def _put_manifest(s3, entries):
+    s3.objects[EVENT["manifest_key"]] = "".join(json.dumps(e) + "\n" for e in entries)
+
+
+def _manifest(s3):
+    return [json.loads(line) for line in s3.objects[EVENT["manifest_key"]].splitlines()]
+
+
+def _entry(i, **extra):
+    e = {"index": i, "start_sec": i * 600.0, "end_sec": (i + 1) * 600.0, "job_id": JOB,
+         "s3_uri": f"s3://ingest/chunks/{JOB}/{i:03d}.mp3"}
+    e.update(extra)
+    return e
+
+
+def _progress(s3, i, done_sec, elapsed=200.0, job_id=None):
+    started = (NOW - timedelta(seconds=elapsed)).isoformat()
+    s3.objects[f"chunks/{JOB}/{i}/progress.json"] = json.dumps(
+        {"started_utc": started, "elapsed_s": elapsed, "audio_done_sec": done_sec, "batch_job_id": job_id})
+
+
+def _slow_job(s3):
+    # chunks 0-3 at 300s/200s (projected 400s); chunk 4 at 100s/200s (projected 1200s)
+    _put_manifest(s3, [_entry(i) for i in range(5)])
+    for i in range(4):
+        _progress(s3, i, 300.0)
+    _progress(s3, 4, 100.0, job_id="parent-4")
+
+
+def _split_entry():
+    return _entry(4, split_at_sec=2500.0, winner=None, subchunks=[
+        {"sub_index": 0, "start_sec": 2499.0, "end_sec": 2750.0, "batch_job_id": "sub-a"},
+        {"sub_index": 1, "start_sec": 2749.0, "end_sec": 3000.0, "batch_job_id": "sub-b"},
+    ])
+
+
+def test_split_submits_subchunks_and_records_them(aws):
+    s3, batch = aws
+    _slow_job(s3)
+
+    res = straggler.handler(EVENT, None)
+
+    assert res["splits"] == [{"index": 4, "split_at_sec": 2500.0}]
+    assert res["done"] is False and res["pending"] == [0, 1, 2, 3, 4]
+    assert [j["jobName"] for j in batch.submitted] == [f"whisper-{JOB}-4-s0", f"whisper-{JOB}-4-s1"]
+    env = {kv["name"]: kv["value"] for kv in batch.submitted[0]["containerOverrides"]["environment"]}
+    assert env["IN_URI"] == f"s3://ingest/chunks/{JOB}/004.mp3"
+    assert env["OUT_URI"] == f"s3://results/chunks/{JOB}/4/sub-0/out.json"
+    assert (env["CLIP_START"], env["CLIP_END"]) == ("99.000", "350.000")
+    assert batch.submitted[0]["containerOverrides"]["vcpus"] == straggler.OVERRIDE_VCPUS
+
+    entry = _manifest(s3)[4]
+    assert entry["split_at_sec"] == 2500.0 and entry["winner"] is None
+    assert [sc["batch_job_id"] for sc in entry["subchunks"]] == ["sub-job-1", "sub-job-2"]
+    assert "subchunks" not in _manifest(s3)[0]
+
+
+def test_subchunk_win_terminates_parent_and_finishes(aws):
+    s3, batch = aws
+    _put_manifest(s3, [_entry(0), _split_entry()])
+    s3.objects[f"chunks/{JOB}/0/out.json"] = "{}"
+    _progress(s3, 4, 150.0, job_id="parent-4")
+    s3.objects[f"chunks/{JOB}/4/sub-0/out.json"] = "{}"
+    s3.objects[f"chunks/{JOB}/4/sub-1/out.json"] = "{}"
+
+    res = straggler.handler(EVENT, None)
+
+    assert batch.terminated == [("parent-4", "straggler: sub-chunks finished first")]
+    assert _manifest(s3)[1]["winner"] == "subchunks"
+    assert res["pending"] == [] and res["done"] is True
+    assert batch.submitted == []
+
+
+def test_parent_win_terminates_subchunks(aws):
+    s3, batch = aws
+    _put_manifest(s3, [_entry(0), _split_entry()])
+    s3.objects[f"chunks/{JOB}/0/out.json"] = "{}"
+    s3.objects[f"chunks/{JOB}/4/out.json"] = "{}"
+    s3.objects[f"chunks/{JOB}/4/sub-0/out.json"] = "{}"
+
+    res = straggler.handler(EVENT, None)
+
+    assert sorted(jid for jid, _ in batch.terminated) == ["sub-a", "sub-b"]
+    assert all(reason == "straggler: parent finished first" for _, reason in batch.terminated)
+    assert _manifest(s3)[1]["winner"] == "parent"
+    assert res["done"] is True
+
+
+def test_unsettled_split_stays_pending(aws):
+    s3, batch = aws
+    _put_manifest(s3, [_entry(0), _split_entry()])
+    s3.objects[f"chunks/{JOB}/0/out.json"] = "{}"
+    s3.objects[f"chunks/{JOB}/4/sub-0/out.json"] = "{}"
+
+    res = straggler.handler(EVENT, None)
+
+    assert batch.terminated == []
+    assert res["pending"] == [4] and res["done"] is False
+
+
+@pytest.mark.parametrize("failing_key", [f"chunks/{JOB}/4/out.json", f"chunks/{JOB}/4/sub-1/out.json"])
+def test_s3_errors_skip_chunk_instead_of_failing(aws, failing_key):
+    s3, batch = aws
+    _put_manifest(s3, [_entry(0), _split_entry()])
+    s3.objects[f"chunks/{JOB}/0/out.json"] = "{}"
+    s3.objects[f"chunks/{JOB}/4/sub-0/out.json"] = "{}"
+    s3.fail_head.add(failing_key)
+
+    res = straggler.handler(EVENT, None)
+
+    assert res["pending"] == [4] and res["done"] is False
+    assert batch.terminated == []
+
+
+def test_submit_throttling_abandons_split_for_this_tick(aws):
+    s3, batch = aws
+    _slow_job(s3)
+    batch.fail_submit_after = 1
+
+    res = straggler.handler(EVENT, None)
+
+    assert res["splits"] == []
+    assert batch.terminated == [("sub-job-1", "straggler: split abandoned")]
+    assert "subchunks" not in _manifest(s3)[4]
+
+
+def test_manifest_write_failure_undoes_splits(aws):
+    s3, batch = aws
+    _slow_job(s3)
+    s3.fail_put = True
+
+    res = straggler.handler(EVENT, None)
+
+    assert res["splits"] == [] and res["done"] is False
+    assert sorted(jid for jid, _ in batch.terminated) == ["sub-job-1", "sub-job-2"]
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+
+import planner
+
+
+def _state(start, end, elapsed, done_sec, **extra):
+    st = {"start_sec": start, "end_sec": end, "elapsed_s": elapsed, "audio_done_sec": done_sec, "done": False}
+    st.update(extra)
+    return st
+
+
+def _job(slow_done_sec, elapsed=200.0, **slow_extra):
+    # four 600s chunks at 300s/200s (projected 400s) plus one slow chunk at index 4
+    states = {i: _state(i * 600.0, (i + 1) * 600.0, elapsed, 300.0) for i in range(4)}
+    states[4] = _state(2400.0, 3000.0, elapsed, slow_done_sec, **slow_extra)
+    return states
+
+
+def test_projected_wall_from_progress_rate():
+    assert planner.projected_wall(_state(0.0, 600.0, 200.0, 300.0)) == pytest.approx(400.0)
+
+
+def test_projected_wall_uses_actual_wall_when_done():
+    assert planner.projected_wall({"done": True, "wall_s": 321.0}) == 321.0
+
+
+def test_projected_wall_waits_for_min_elapsed():
+    assert planner.projected_wall(_state(0.0, 600.0, planner.MIN_ELAPSED_SEC - 1, 10.0)) is None
+
+
+def test_projected_wall_zero_progress_is_infinite():
+    assert planner.projected_wall(_state(0.0, 600.0, 200.0, 0.0)) == math.inf
+
+
+def test_splits_chunk_over_threshold():
+    # 100s done in 200s -> projected 1200s vs median 400s
+    plans = planner.plan_splits(_job(100.0))
+    assert [p["index"] for p in plans] == [4]
+    plan = plans[0]
+    assert plan["split_at_sec"] == 2500.0
+    assert plan["median_wall_s"] == 400.0
+    windows = [(sc["start_sec"], sc["end_sec"]) for sc in plan["subchunks"]]
+    assert windows[0][0] == 2500.0 - planner.OVERLAP_SEC
+    assert windows[-1][1] == 3000.0
+
+
+def test_no_split_under_threshold():
+    # 240s done in 200s -> projected 500s, under 400s * 1.5
+    assert planner.plan_splits(_job(240.0)) == []
+
+
+def test_no_split_before_min_elapsed():
+    assert planner.plan_splits(_job(10.0, elapsed=planner.MIN_ELAPSED_SEC - 1)) == []
+
+
+def test_no_split_when_remaining_below_min():
+    states = _job(100.0)
+    states[4] = _state(2400.0, 2400.0 + 100.0 + planner.MIN_REMAINING_SEC - 1, 200.0, 100.0)
+    assert planner.plan_splits(states) == []
+
+
+def test_already_split_chunk_is_not_split_again():
+    assert planner.plan_splits(_job(100.0, subchunks=[{"sub_index": 0}])) == []
+
+
+def test_zero_progress_chunk_splits_from_its_own_start():
+    plans = planner.plan_splits(_job(0.0))
+    assert [p["index"] for p in plans] == [4]
+    assert plans[0]["split_at_sec"] == 2400.0
+    assert plans[0]["projected_wall_s"] is None
+    assert plans[0]["subchunks"][0]["start_sec"] == 2400.0
+
+
+def test_split_windows_overlap_and_cover_span():
+    windows = planner.split_windows(0.0, 100.0, 400.0, ways=3, overlap=1.0)
+    assert windows == [(99.0, 200.0), (199.0, 300.0), (299.0, 400.0)]
+
+
+def test_split_windows_clamp_to_chunk_start():
+    assert planner.split_windows(600.0, 600.0, 1200.0, ways=2, overlap=1.0)[0] == (600.0, 900.0)
+
+
+@pytest.mark.parametrize(
+    "parent_done,subs_done,expected",
+    [
+        (True, [False, False], "parent"),
+        (True, [True, True], "parent"),
+        (False, [True, True], "subchunks"),
+        (False, [True, False], None),
+        (False, [], None),
+    ],
+)
+def test_resolve_winner(parent_done, subs_done, expected):
+    assert planner.resolve_winner(parent_done, subs_done) == expected
+
+
+def test_simulation_cuts_makespan_for_injected_delay():
+    res = planner.simulate(6, 600.0, 10.0, {3: 4.0}, tick_s=15.0, startup_s=30.0)
+    assert res["makespan_s"] < res["baseline_makespan_s"]
+    slow = res["manifest"][3]
+    assert slow["winner"] == "subchunks"
+    assert all("subchunks" not in e for i, e in enumerate(res["manifest"]) if i != 3)